@@ -16,17 +16,25 @@ Dependencies:
   - Flask
   - docxtpl
   - openpyxl
+  - Jinja2
   - (Optional) docx2pdf for PDF conversion
 """
 
 import os
 import re
 import sys
-import glob
+import io
+import copy
 import zipfile
+import functools
+import uuid
+import time
 import tempfile
-import shutil
-from flask import Flask, render_template, request, redirect, url_for, send_from_directory, flash
+import threading
+import concurrent.futures
+from urllib.parse import quote
+import jinja2
+from flask import Flask, render_template, request, redirect, url_for, send_from_directory, flash, jsonify
 from docxtpl import DocxTemplate
 # from docx2pdf import convert  # Uncomment if PDF conversion is desired and supported on your server
 from openpyxl import Workbook, load_workbook
@@ -40,11 +48,58 @@ ORIGINAL_TEMPLATES_DIR = BASE_DIR  # Adjust if original templates are stored els
 SANITIZED_DIR = os.path.join(BASE_DIR, "sanitized_templates")
 OUTPUT_DIR = os.path.join(BASE_DIR, "output")
 SALESPEOPLE_FILE = os.path.join(BASE_DIR, "salespersons.xlsx")
+# Sanitized templates are built in memory; set to True to also keep a copy in SANITIZED_DIR for debugging.
+KEEP_SANITIZED_TEMPLATES = False
+
+# Let the front-end web server send downloads (sendfile) instead of streaming them through Python.
+# USE_X_SENDFILE=1 emits X-Sendfile (Apache mod_xsendfile, lighttpd). X_ACCEL_REDIRECT_PREFIX emits
+# X-Accel-Redirect for nginx and must name an `internal` location aliased to OUTPUT_DIR, e.g. "/output/".
+X_ACCEL_REDIRECT_PREFIX = os.environ.get("X_ACCEL_REDIRECT_PREFIX", "")
+app.config["USE_X_SENDFILE"] = os.environ.get("USE_X_SENDFILE") == "1" or bool(X_ACCEL_REDIRECT_PREFIX)
 
 # Ensure required folders exist.
 os.makedirs(SANITIZED_DIR, exist_ok=True)
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# Placeholders filled from the chosen salesperson rather than the form.
+SALESPERSON_PLACEHOLDERS = frozenset({"Salesperson_Name", "Salesperson_Email", "Salesperson_Phone"})
+
+# Rendering and saving run off the request thread. Jobs live in this process only, so run a
+# single worker process (the Procfile default) or route a job's polls to the process that made it.
+EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+JOBS = {}  # job id -> (future, output filename)
+JOB_TTL_SECONDS = 15 * 60  # Finished jobs whose result page is never viewed are dropped after this.
+_JOB_FINISHED_AT = {}  # job id -> time.monotonic() when the job finished
+_JOBS_LOCK = threading.Lock()
+# Read once at import (os.umask can only be queried by setting it). mkstemp creates files as
+# 0600; generated documents are switched to the usual umask-default mode, so a front-end
+# server running as another user can still read them for X-Sendfile / X-Accel-Redirect.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_OUTPUT_FILE_MODE = 0o666 & ~_UMASK
+
+# Pre-compiled pattern used when sanitizing placeholder names.
+_WORD_RE = re.compile(r'\W+')
+
+class _TemplateCachingEnvironment(jinja2.Environment):
+    """
+    Jinja environment whose from_string() reuses compiled templates.
+    docxtpl calls from_string() with the same part XML on every render of a given template,
+    so compiling it once per distinct source skips Jinja's parse/compile step on repeat renders.
+    """
+
+    def from_string(self, source, globals=None, template_class=None):
+        if globals is None and template_class is None and isinstance(source, str):
+            return self._compile_cached(source)
+        return super().from_string(source, globals, template_class)
+
+    @functools.lru_cache(maxsize=64)
+    def _compile_cached(self, source):
+        return super().from_string(source)
+
+# Shared across renders; docxtpl's own default builds a plain Template for each part instead.
+SHARED_JINJA = _TemplateCachingEnvironment(autoescape=False, cache_size=-1, auto_reload=False)
+
 # --------------------
 # Salesperson XLSX Utilities
 # --------------------
@@ -59,99 +114,252 @@ def init_salespeople_file():
 
 def get_salespeople():
     """Return a list of salespersons as dictionaries from salespersons.xlsx."""
+    return list(_salespeople()[0])
+
+def find_salesperson(name):
+    """Return the salesperson whose name matches name (case-insensitively), or None."""
+    return _salespeople()[1].get(name.strip().lower())
+
+def _salespeople():
+    """Return the cached (salespeople, by_name) pair for the current salespersons.xlsx."""
     init_salespeople_file()
-    wb = load_workbook(SALESPEOPLE_FILE)
-    ws = wb.active
-    salespeople = []
-    # Skip header row (first row)
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        if row and any(row):
-            sp = {"Name": row[0] or "", "Email": row[1] or "", "Phone": row[2] or ""}
-            salespeople.append(sp)
-    return salespeople
+    return _load_salespeople(os.path.getmtime(SALESPEOPLE_FILE))
+
+@functools.lru_cache(maxsize=1)
+def _load_salespeople(mtime):
+    """
+    Parse salespersons.xlsx into a tuple of salesperson dictionaries plus a dict indexing
+    them by lowercased name. The file's mtime is only used as the cache key, so the
+    workbook is re-read whenever it changes on disk.
+    """
+    # read_only streams the sheet instead of building full Cell objects.
+    wb = load_workbook(SALESPEOPLE_FILE, read_only=True, data_only=True)
+    try:
+        ws = wb.active
+        salespeople = []
+        # Skip header row (first row)
+        for row in ws.iter_rows(min_row=2, values_only=True):
+            if row and any(row):
+                sp = {"Name": row[0] or "", "Email": row[1] or "", "Phone": row[2] or ""}
+                salespeople.append(sp)
+    finally:
+        wb.close()
+    by_name = {}
+    for sp in salespeople:
+        by_name.setdefault(str(sp["Name"]).strip().lower(), sp)  # First row wins, as before.
+    return tuple(salespeople), by_name
 
 # --------------------
 # Document Generation Utilities
 # --------------------
 
-def extract_placeholders_from_xml(docx_path):
+def _file_signature(path):
+    """Return (mtime, size) for path, or None if the file cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime, st.st_size
+
+def _find_placeholders(text):
     """
-    Extract placeholders from the document.xml inside the DOCX.
-    Returns a list of unique placeholder strings.
+    Yield (start, end, inner) for each {{...}} span in text, matching what the lazy regex
+    {{(.*?)}} would find. Scanning with str.find keeps this linear even when the text has
+    many unmatched "{{", where the regex would rescan to the end of the text for each one.
     """
-    try:
-        with zipfile.ZipFile(docx_path, "r") as z:
-            xml_content = z.read("word/document.xml").decode("utf-8")
-    except Exception as e:
-        print(f"Error reading the DOCX file: {e}")
-        return []
-    raw_matches = re.findall(r'{{(.*?)}}', xml_content, re.DOTALL)
-    placeholders = set()
-    for match in raw_matches:
-        cleaned = re.sub(r'<[^>]+>', '', match).strip()
-        if cleaned:
-            placeholders.add(cleaned)
-    return list(placeholders)
+    i = text.find("{{")
+    while i >= 0:
+        k = text.find("}}", i + 2)
+        if k < 0:
+            return  # No closing braces left, so no later "{{" can match either.
+        yield i, k + 2, text[i + 2:k]
+        i = text.find("{{", k + 2)
+
+def _sub_placeholders(text, replace):
+    """Return text with each {{...}} span replaced by replace(full_match, inner)."""
+    out = []
+    pos = 0
+    for start, end, inner in _find_placeholders(text):
+        out.append(text[pos:start])
+        out.append(replace(text[start:end], inner))
+        pos = end
+    out.append(text[pos:])
+    return "".join(out)
+
+def _strip_tags(fragment):
+    """
+    Remove XML tags from a document.xml fragment, keeping only the text between them.
+    A single str.find scan is cheaper than running a second regex over every placeholder.
+    """
+    out = []
+    i = 0
+    while True:
+        j = fragment.find("<", i)
+        if j < 0:
+            out.append(fragment[i:])
+            break
+        out.append(fragment[i:j])
+        k = fragment.find(">", j)
+        if k < 0:
+            out.append(fragment[j:])  # Unterminated tag: keep the remainder as text.
+            break
+        i = k + 1
+    return "".join(out)
+
+def _clone_zipinfo(info):
+    """
+    Return a fresh ZipInfo for writing info's entry to a new archive.
+    Keeps the name, timestamp, permissions and compression method (so stored media stays
+    ZIP_STORED) without carrying over offsets, CRCs or flags from the source archive.
+    """
+    new_info = zipfile.ZipInfo(filename=info.filename, date_time=info.date_time)
+    new_info.compress_type = info.compress_type
+    new_info.external_attr = info.external_attr
+    return new_info
 
 def sanitize_placeholder(placeholder):
     """
     Convert a placeholder to a valid Python identifier by replacing non-alphanumeric characters with underscores.
     """
-    sanitized = re.sub(r'\W+', '_', placeholder)
+    sanitized = _WORD_RE.sub('_', placeholder)
     return sanitized.strip('_')
 
-def sanitize_template_xml(template_path, mapping, sanitized_dir):
+def sanitize_template_xml(template_path, sanitized_dir=None):
     """
-    Create a sanitized version of the DOCX template.
-    For each placeholder in the DOCX that, when cleaned, matches one of the keys in mapping,
-    replace it with the corresponding sanitized version.
-    The new DOCX is stored in sanitized_dir.
-    Returns the path to the new sanitized template.
+    Create a sanitized version of the DOCX template in memory, in a single pass over document.xml.
+    Every placeholder is cleaned of inline tags, recorded, and rewritten to its sanitized
+    version (see sanitize_placeholder). Every other part is copied across as-is.
+    If sanitized_dir is given, a copy of the new DOCX is also written there.
+    Returns a (placeholders, data) tuple, where placeholders is a sorted tuple of
+    (placeholder, sanitized_key) pairs and data is the DOCX bytes, or None on failure.
     """
-    os.makedirs(sanitized_dir, exist_ok=True)
-    temp_dir = tempfile.mkdtemp()
-    with zipfile.ZipFile(template_path, 'r') as zin:
-        zin.extractall(temp_dir)
-    doc_xml_path = os.path.join(temp_dir, "word", "document.xml")
+    found = {}
+    def replacement(full_match, inner):
+        cleaned = _strip_tags(inner).strip()
+        if not cleaned:
+            return full_match
+        key = found.get(cleaned)
+        if key is None:
+            key = found[cleaned] = sanitize_placeholder(cleaned)
+        return "{{" + key + "}}"
+    buf = io.BytesIO()
     try:
-        with open(doc_xml_path, "r", encoding="utf-8") as f:
-            xml_content = f.read()
+        # The sanitized zip is a short-lived intermediate read straight back by docxtpl,
+        # so favour fast compression over size.
+        with zipfile.ZipFile(template_path, "r") as zin, \
+                zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info in zin.infolist():
+                with zin.open(info, "r") as fp:
+                    data = fp.read()
+                if info.filename == "word/document.xml":
+                    new_xml = _sub_placeholders(data.decode("utf-8"), replacement)
+                    data = new_xml.encode("utf-8")
+                zout.writestr(_clone_zipinfo(info), data, compresslevel=1)
     except Exception as e:
-        print(f"Error reading document.xml: {e}")
-        shutil.rmtree(temp_dir)
-        return None
-    def replacement(match):
-        full_match = match.group(0)
-        inner = match.group(1)
-        cleaned = re.sub(r'<[^>]+>', '', inner).strip()
-        if cleaned in mapping:
-            return "{{" + mapping[cleaned] + "}}"
-        else:
-            return full_match
-    new_xml = re.sub(r'{{(.*?)}}', replacement, xml_content, flags=re.DOTALL)
+        print(f"Error building sanitized template: {e}")
+        return (), None
+    sanitized_data = buf.getvalue()
+    if sanitized_dir:
+        os.makedirs(sanitized_dir, exist_ok=True)
+        sanitized_template_path = os.path.join(sanitized_dir, "sanitized_" + os.path.basename(template_path))
+        try:
+            with open(sanitized_template_path, "wb") as f:
+                f.write(sanitized_data)
+        except Exception as e:
+            print(f"Error writing sanitized template copy: {e}")
+    return tuple(sorted(found.items())), sanitized_data
+
+def build_sanitized(template_path, sanitized_dir=None):
+    """
+    Return the (placeholders, data) result of sanitize_template_xml, reusing the result of an
+    earlier request when the template (path, mtime, size) is unchanged.
+    """
+    signature = _file_signature(template_path)
+    if signature is None:
+        return sanitize_template_xml(template_path, sanitized_dir)
+    placeholders, sanitized_data = _sanitize_cached(template_path, *signature, sanitized_dir)
+    if sanitized_data is None:
+        _sanitize_cached.cache_clear()  # Don't remember failures.
+    return placeholders, sanitized_data
+
+@functools.lru_cache(maxsize=16)
+def _sanitize_cached(template_path, mtime, size, sanitized_dir):
+    """Cached wrapper around sanitize_template_xml; mtime and size only serve as the cache key."""
+    return sanitize_template_xml(template_path, sanitized_dir)
+
+def load_docx_template(sanitized_data):
+    """
+    Return a DocxTemplate ready to render the sanitized DOCX bytes, reusing a cached parse of
+    the same bytes. docxtpl mutates the document while rendering, so each call gets its own
+    deep copy of the cached python-docx Document.
+    """
+    doc = DocxTemplate(io.BytesIO(sanitized_data))
+    doc.docx = copy.deepcopy(_parse_docx_template(sanitized_data).docx)
+    return doc
+
+@functools.lru_cache(maxsize=16)
+def _parse_docx_template(sanitized_data):
+    """Parse the sanitized DOCX bytes once per distinct template."""
+    doc = DocxTemplate(io.BytesIO(sanitized_data))
+    doc.init_docx()
+    return doc
+
+def _render_and_save(sanitized_data, context, output_path):
+    """
+    Render the sanitized template with context and save it to output_path.
+    Runs on EXECUTOR. Returns None on success, or an error message to show the user.
+    """
     try:
-        with open(doc_xml_path, "w", encoding="utf-8") as f:
-            f.write(new_xml)
+        doc = load_docx_template(sanitized_data)
+        doc.render(context, jinja_env=SHARED_JINJA)
     except Exception as e:
-        print(f"Error writing modified document.xml: {e}")
-        shutil.rmtree(temp_dir)
-        return None
-    sanitized_template_path = os.path.join(sanitized_dir, "sanitized_" + os.path.basename(template_path))
-    with zipfile.ZipFile(sanitized_template_path, "w", zipfile.ZIP_DEFLATED) as zout:
-        for foldername, subfolders, filenames in os.walk(temp_dir):
-            for filename in filenames:
-                file_path = os.path.join(foldername, filename)
-                arcname = os.path.relpath(file_path, temp_dir)
-                zout.write(file_path, arcname)
-    shutil.rmtree(temp_dir)
-    return sanitized_template_path
-
-def get_value_case_insensitive(dictionary, target_key, default):
-    """Retrieve a value from a dictionary using case-insensitive key matching."""
-    for key, value in dictionary.items():
-        if key.strip().lower() == target_key.strip().lower():
-            return value.strip() if value.strip() else default
-    return default
+        print(f"Error rendering the document: {e}")
+        return "Error rendering the document."
+    # Save to a unique temp file and swap it into place, so concurrent jobs for the same
+    # output name (double submits, same client and date) never interleave writes to one file.
+    temp_path = None
+    try:
+        # Inside the try: the output name comes from user input and may point at a missing directory.
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(output_path), prefix=".", suffix=".tmp")
+        os.close(fd)
+        doc.save(temp_path)
+        os.chmod(temp_path, _OUTPUT_FILE_MODE)
+        os.replace(temp_path, output_path)
+        # convert(output_path)  # Uncomment together with the docx2pdf import for PDF output
+    except Exception as e:
+        print(f"Error saving the generated document: {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+        return "Error saving the generated document."
+    return None
+
+def _add_job(future, output_filename):
+    """Register a submitted job and return its id; expired finished jobs are pruned first."""
+    job_id = uuid.uuid4().hex
+    with _JOBS_LOCK:
+        _prune_jobs()
+        JOBS[job_id] = (future, output_filename)
+    future.add_done_callback(lambda _: _mark_job_finished(job_id))
+    return job_id
+
+def _mark_job_finished(job_id):
+    """Done-callback: record when a job finished so _prune_jobs can expire it."""
+    with _JOBS_LOCK:
+        if job_id in JOBS:
+            _JOB_FINISHED_AT[job_id] = time.monotonic()
+
+def _forget_job(job_id):
+    """Remove a job once its result has been shown."""
+    with _JOBS_LOCK:
+        JOBS.pop(job_id, None)
+        _JOB_FINISHED_AT.pop(job_id, None)
+
+def _prune_jobs():
+    """Drop jobs that finished more than JOB_TTL_SECONDS ago. Caller holds _JOBS_LOCK."""
+    cutoff = time.monotonic() - JOB_TTL_SECONDS
+    for job_id in [j for j, finished_at in _JOB_FINISHED_AT.items() if finished_at < cutoff]:
+        JOBS.pop(job_id, None)
+        del _JOB_FINISHED_AT[job_id]
 
 # --------------------
 # Flask Routes
@@ -161,8 +369,11 @@ def get_value_case_insensitive(dictionary, target_key, default):
 def index():
     """Home page: List available original templates and display the salesperson table."""
     # List only original templates (exclude any starting with "sanitized_")
-    template_files = [f for f in glob.glob(os.path.join(ORIGINAL_TEMPLATES_DIR, "*Template*.docx"))
-                      if not os.path.basename(f).startswith("sanitized_")]
+    with os.scandir(ORIGINAL_TEMPLATES_DIR) as entries:
+        template_files = sorted(entry.path for entry in entries
+                                if "Template" in entry.name and entry.name.endswith(".docx")
+                                and not entry.name.startswith(("sanitized_", "."))
+                                and entry.is_file(follow_symlinks=False))
     salespeople = get_salespeople()
     return render_template("index.html",
                            template_files=template_files,
@@ -179,14 +390,19 @@ def select_template():
     if not template_file:
         flash("No template selected.")
         return redirect(url_for("index"))
-    placeholders = extract_placeholders_from_xml(template_file)
+    # Use the same (cached) sanitizing pass as generate_document, so the form's field names
+    # are exactly the keys it will read back.
+    placeholders, sanitized_data = build_sanitized(
+        template_file, SANITIZED_DIR if KEEP_SANITIZED_TEMPLATES else None)
+    if sanitized_data is None:
+        flash("Error reading the selected template.")
+        return redirect(url_for("index"))
     if not placeholders:
         flash("No placeholders found in the selected template.")
         return redirect(url_for("index"))
-    placeholders.sort()
     # Filter out salesperson placeholders from the manual entry list.
-    filtered_placeholders = [ph for ph in placeholders
-                             if ph not in ["Salesperson_Name", "Salesperson_Email", "Salesperson_Phone"]]
+    filtered_placeholders = [(ph, key) for ph, key in placeholders
+                             if ph not in SALESPERSON_PLACEHOLDERS]
     salespeople = get_salespeople()
     return render_template("fill_placeholders.html",
                            template_file=template_file,
@@ -196,65 +412,91 @@ def select_template():
 @app.route('/generate_document', methods=["POST"])
 def generate_document():
     """
-    Process form data, generate the document, and provide a download link.
+    Process form data and start generating the document in the background.
+    Redirects to the job's result page, which provides the download link once it is ready.
     The chosen salesperson’s details are automatically injected into the context.
     """
     template_file = request.form.get("template_file")
     if not template_file:
         flash("Template file missing.")
         return redirect(url_for("index"))
-    # Re-extract the placeholders from the template (if needed)
-    all_placeholders = extract_placeholders_from_xml(template_file)
-    all_placeholders.sort()
-    mapping = {}
-    raw_values = {}
+    # Extract the placeholders and create a sanitized version of the template in one pass.
+    all_placeholders, sanitized_data = build_sanitized(
+        template_file, SANITIZED_DIR if KEEP_SANITIZED_TEMPLATES else None)
+    if sanitized_data is None:
+        flash("Error sanitizing the template.")
+        return redirect(url_for("index"))
     context = {}
-    # Process only non-salesperson placeholders from the form.
-    for ph in all_placeholders:
-        if ph in ["Salesperson_Name", "Salesperson_Email", "Salesperson_Phone"]:
+    # Raw values keyed by lowercased placeholder, for the case-insensitive filename lookups below.
+    raw_lower = {}
+    # Process only non-salesperson placeholders from the form, in a single pass.
+    for ph, key in all_placeholders:
+        if ph in SALESPERSON_PLACEHOLDERS:
             continue  # Skip these—will be auto-filled.
-        key = sanitize_placeholder(ph)
-        mapping[ph] = key
-        value = request.form.get(key)
-        raw_values[ph] = value
+        value = request.form.get(key) or ""
         context[key] = value
+        raw_lower[ph.strip().lower()] = value.strip()
     # Get the selected salesperson from the dropdown.
     selected_salesperson = request.form.get("salesperson")
     if selected_salesperson:
-        salespeople = get_salespeople()
-        sp = next((s for s in salespeople if s["Name"].strip().lower() == selected_salesperson.strip().lower()), None)
+        sp = find_salesperson(selected_salesperson)
         if sp:
             context["Salesperson_Name"] = sp["Name"]
             context["Salesperson_Email"] = sp["Email"]
             context["Salesperson_Phone"] = sp["Phone"]
-    # Create a sanitized version of the template.
-    sanitized_template_path = sanitize_template_xml(template_file, mapping, SANITIZED_DIR)
-    if not sanitized_template_path:
-        flash("Error sanitizing the template.")
-        return redirect(url_for("index"))
-    try:
-        doc = DocxTemplate(sanitized_template_path)
-        doc.render(context)
-    except Exception as e:
-        flash("Error rendering the document.")
-        return redirect(url_for("index"))
     # Build output filename using raw values for "Client Company Name" and "Proposal date"
-    client_name = get_value_case_insensitive(raw_values, "Client Company Name", "UnknownClient")
-    proposal_date = get_value_case_insensitive(raw_values, "Proposal date", "UnknownDate")
+    client_name = raw_lower.get("client company name") or "UnknownClient"
+    proposal_date = raw_lower.get("proposal date") or "UnknownDate"
     filename_base = f"Proposal_{client_name}_{proposal_date}"
     output_filename = filename_base + ".docx"
     output_path = os.path.join(OUTPUT_DIR, output_filename)
-    try:
-        doc.save(output_path)
-    except Exception as e:
-        flash("Error saving the generated document.")
+    # Render and save in the background; the result page polls until the job is done.
+    future = EXECUTOR.submit(_render_and_save, sanitized_data, context, output_path)
+    job_id = _add_job(future, output_filename)
+    return redirect(url_for("job_result", job_id=job_id))
+
+@app.route('/job_status/<job_id>')
+def job_status(job_id):
+    """Report whether a document generation job has finished."""
+    job = JOBS.get(job_id)
+    if job is None:
+        return jsonify(error="Unknown job."), 404
+    return jsonify(done=job[0].done())
+
+@app.route('/result/<job_id>')
+def job_result(job_id):
+    """Show a processing page until the job finishes, then the download link (or the error)."""
+    job = JOBS.get(job_id)
+    if job is None:
+        flash("Unknown or expired document job.")
+        return redirect(url_for("index"))
+    future, output_filename = job
+    if not future.done():
+        return render_template("processing.html", job_id=job_id)
+    _forget_job(job_id)
+    if future.exception() is not None:
+        print(f"Error generating the document: {future.exception()}")
+        error = "Error generating the document."
+    else:
+        error = future.result()
+    if error:
+        flash(error)
         return redirect(url_for("index"))
     return render_template("result.html", output_filename=output_filename)
 
 @app.route('/download/<filename>')
 def download(filename):
-    """Serve a generated file for download."""
-    return send_from_directory(OUTPUT_DIR, filename, as_attachment=True)
+    """
+    Serve a generated file for download, handing the transfer to the front-end server if configured.
+    Responses carry an ETag and Last-Modified so repeat downloads revalidate to a 304. They are not
+    given a max-age, because regenerating a proposal overwrites the file under the same name.
+    """
+    response = send_from_directory(OUTPUT_DIR, filename, as_attachment=True,
+                                   conditional=True, etag=True)
+    response.cache_control.private = True  # Proposals hold client details; keep them out of shared caches.
+    if X_ACCEL_REDIRECT_PREFIX and response.headers.pop("X-Sendfile", None):
+        response.headers["X-Accel-Redirect"] = X_ACCEL_REDIRECT_PREFIX + quote(filename)
+    return response
 
 # --------------------
 # Run the App